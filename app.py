@@ -0,0 +1,390 @@
+import atexit
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from uuid import uuid4
+
+import orjson
+import psycopg2
+import psycopg2.extras
+import psycopg2.pool
+import redis
+from celery import Celery
+from flask import Flask, Response, jsonify, request
+from werkzeug.utils import secure_filename
+
+app = Flask(__name__)
+
+UPLOAD_FOLDER = "uploads"
+_ALLOWED_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "mp4"})
+_ALLOWED_MIMETYPES = ("image/", "video/")
+MAX_FILE_SIZE_MB = 10
+COPY_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MAX_PAGE_SIZE = 500
+
+# Chunked (resumable) uploads: large media arrives as sequential PATCHes
+# of roughly UPLOAD_CHUNK_SIZE bytes, so the 10 MB single-request cap no
+# longer limits video. 1 MiB chunks are the throughput sweet spot; the
+# size is advertised to clients and tunable via env.
+PART_FOLDER = os.path.join(UPLOAD_FOLDER, "partial")
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", str(COPY_CHUNK_SIZE)))
+MAX_CHUNKED_FILE_SIZE_MB = int(os.environ.get("MAX_CHUNKED_FILE_SIZE_MB", "200"))
+CHUNK_STATE_TTL_SECONDS = 86400
+
+# Werkzeug rejects oversize requests at the WSGI layer, before buffering.
+app.config["MAX_CONTENT_LENGTH"] = MAX_FILE_SIZE_MB * 1024 * 1024
+
+# A PATCH chunk is an ordinary request body, so a chunk size above
+# MAX_CONTENT_LENGTH would make Werkzeug 413 every chunk. Refuse the
+# misconfiguration at startup instead of failing silently per upload.
+if UPLOAD_CHUNK_SIZE > app.config["MAX_CONTENT_LENGTH"]:
+    raise ValueError(
+        f"UPLOAD_CHUNK_SIZE ({UPLOAD_CHUNK_SIZE}) cannot exceed "
+        f"MAX_CONTENT_LENGTH ({app.config['MAX_CONTENT_LENGTH']})"
+    )
+
+DB_CONFIG = {
+    "host": os.environ.get("DB_HOST", "localhost"),
+    "port": int(os.environ.get("DB_PORT", "5432")),
+    "dbname": os.environ.get("DB_NAME", "crop_diagnosis"),
+    "user": os.environ.get("DB_USER", "postgres"),
+    "password": os.environ.get("DB_PASSWORD", "postgres"),
+}
+
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+os.makedirs(PART_FOLDER, exist_ok=True)
+
+# One pool per process; connections are reused across requests instead of
+# paying TCP + auth setup on every call.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Create the connection pool on first use.
+
+    Lazy so that importing the module (gunicorn's preload master, tests)
+    opens no sockets; each forked worker builds its own pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = psycopg2.pool.ThreadedConnectionPool(
+                minconn=2, maxconn=20, **DB_CONFIG
+            )
+            atexit.register(_pool.closeall)
+    return _pool
+
+celery = Celery(
+    "uploads",
+    broker=os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    backend=os.environ.get("CELERY_RESULT_BACKEND", "redis://localhost:6379/1"),
+)
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+r = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool.from_url(
+        REDIS_URL, max_connections=32
+    )
+)
+
+# Cached in Redis (not an in-process lru_cache) so every worker sees the
+# same entry and write-side invalidation works across workers.
+UPLOADS_CACHE_KEY = "uploads:v1"
+CACHE_TTL_SECONDS = 3
+
+
+@contextmanager
+def get_conn():
+    """Check a connection out of the pool, committing on success.
+
+    Rolls back and re-raises on error, and always returns the connection
+    to the pool so a failed request cannot leak it.
+    """
+    pool = _get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def allowed_file(filename):
+    return os.path.splitext(filename)[1][1:].lower() in _ALLOWED_EXTENSIONS
+
+
+@celery.task
+def persist_metadata(filename, device_id, language, timestamp, file_path):
+    """Write upload metadata from a worker so the HTTP response never waits on it."""
+    return save_metadata(filename, device_id, language, timestamp, file_path)
+
+
+# Prepared once per pooled connection; afterwards only bind + execute
+# cross the wire instead of a fresh parse + plan per insert.
+_INSERT_MEDIA_PREPARE = (
+    "PREPARE ins_media AS "
+    "INSERT INTO media_uploads (filename, device_id, language, uploaded_at, file_path) "
+    "VALUES ($1, $2, $3, to_timestamp($4), $5) RETURNING id"
+)
+
+_INSERT_MEDIA_EXECUTE = "EXECUTE ins_media (%s, %s, %s, %s, %s)"
+
+
+def save_metadata(filename, device_id, language, timestamp, file_path):
+    params = (filename, device_id, language, timestamp, file_path)
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(_INSERT_MEDIA_EXECUTE, params)
+            except psycopg2.errors.InvalidSqlStatementName:
+                # Fresh connection, or the statement was deallocated by
+                # an earlier rollback. The failed EXECUTE aborted the
+                # transaction, so roll back, re-prepare and retry; the
+                # server itself is the source of truth for what is
+                # prepared, so no client-side cache to go stale.
+                conn.rollback()
+                cur.execute(_INSERT_MEDIA_PREPARE)
+                cur.execute(_INSERT_MEDIA_EXECUTE, params)
+            row_id = cur.fetchone()[0]
+    r.delete(UPLOADS_CACHE_KEY)
+    return row_id
+
+
+def fetch_all_uploads(limit=100, before=None):
+    """Yield upload rows newest-first, one page at a time.
+
+    A named (server-side) cursor streams rows instead of materializing
+    the whole table with fetchall(), so memory stays O(page) as the
+    table grows. `before` enables keyset pagination on uploaded_at.
+    """
+    with get_conn() as conn:
+        with conn.cursor(
+            name="uploads_cur", cursor_factory=psycopg2.extras.RealDictCursor
+        ) as cur:
+            cur.itersize = 1000
+            cur.execute(
+                "SELECT id, filename, device_id, language, uploaded_at, file_path "
+                "FROM media_uploads "
+                "WHERE (%s::timestamptz IS NULL OR uploaded_at < %s) "
+                "ORDER BY uploaded_at DESC LIMIT %s",
+                (before, before, limit),
+            )
+            # RealDictCursor rows are already dicts; orjson serializes the
+            # datetime column natively, so no per-row isoformat() either.
+            yield from cur
+
+
+@app.route("/api/upload", methods=["POST"])
+def upload_media():
+    if "file" not in request.files:
+        return jsonify({"status": "error", "message": "No file part in request"}), 400
+
+    file = request.files["file"]
+    if file.filename == "":
+        return jsonify({"status": "error", "message": "No file selected"}), 400
+    if not allowed_file(file.filename):
+        return jsonify({"status": "error", "message": "File type not allowed"}), 400
+    # Defense in depth: the declared MIME type has to look like media too.
+    if file.mimetype and not file.mimetype.startswith(_ALLOWED_MIMETYPES):
+        return jsonify({"status": "error", "message": "Media type not allowed"}), 400
+
+    # Content-Length is enough to reject oversize uploads; no need to
+    # seek through the (possibly disk-spooled) temp file to measure it.
+    if request.content_length and request.content_length > MAX_FILE_SIZE_MB * 1024 * 1024:
+        return (
+            jsonify(
+                {
+                    "status": "error",
+                    "message": f"File exceeds {MAX_FILE_SIZE_MB} MB limit",
+                }
+            ),
+            413,
+        )
+
+    # One clock read covers the filename prefix, the DB column and the
+    # response; the ISO string is only formatted for the reply.
+    now = time.time()
+    safe_filename = f"{int(now)}_{secure_filename(file.filename)}"
+    save_path = os.path.join(UPLOAD_FOLDER, safe_filename)
+    with open(save_path, "wb") as buffer:
+        shutil.copyfileobj(file.stream, buffer, length=COPY_CHUNK_SIZE)
+
+    persist_metadata.delay(
+        safe_filename,
+        request.form.get("device_id", "unknown"),
+        request.form.get("language", "en"),
+        now,
+        save_path,
+    )
+
+    return (
+        jsonify(
+            {
+                "status": "success",
+                "filename": safe_filename,
+                "uploaded_at": datetime.utcfromtimestamp(now).isoformat(),
+            }
+        ),
+        200,
+    )
+
+
+@app.route("/api/upload/init", methods=["POST"])
+def init_chunked_upload():
+    length = request.headers.get("Upload-Length", type=int)
+    filename = request.headers.get("Upload-Filename", "")
+    if not length or length <= 0:
+        return jsonify({"status": "error", "message": "Missing Upload-Length"}), 400
+    if length > MAX_CHUNKED_FILE_SIZE_MB * 1024 * 1024:
+        return (
+            jsonify(
+                {
+                    "status": "error",
+                    "message": f"File exceeds {MAX_CHUNKED_FILE_SIZE_MB} MB limit",
+                }
+            ),
+            413,
+        )
+    if not allowed_file(filename):
+        return jsonify({"status": "error", "message": "File type not allowed"}), 400
+
+    upload_id = uuid4().hex
+    meta = {
+        "length": length,
+        "filename": filename,
+        "device_id": request.headers.get("X-Device-Id", "unknown"),
+        "language": request.headers.get("X-Language", "en"),
+    }
+    r.setex(f"chunk:{upload_id}:meta", CHUNK_STATE_TTL_SECONDS, orjson.dumps(meta))
+    r.setex(f"chunk:{upload_id}:received", CHUNK_STATE_TTL_SECONDS, 0)
+    # Preallocate the part file so PATCHes can pwrite at any valid offset.
+    with open(os.path.join(PART_FOLDER, upload_id), "wb"):
+        pass
+
+    return (
+        jsonify(
+            {
+                "status": "success",
+                "upload_id": upload_id,
+                "chunk_size": UPLOAD_CHUNK_SIZE,
+            }
+        ),
+        201,
+    )
+
+
+@app.route("/api/upload/<upload_id>", methods=["HEAD"])
+def chunked_upload_status(upload_id):
+    received = r.get(f"chunk:{upload_id}:received")
+    if received is None:
+        return Response(status=404)
+    resp = Response(status=200)
+    resp.headers["Upload-Offset"] = received.decode()
+    return resp
+
+
+@app.route("/api/upload/<upload_id>", methods=["PATCH"])
+def upload_chunk(upload_id):
+    meta_raw = r.get(f"chunk:{upload_id}:meta")
+    if meta_raw is None:
+        return jsonify({"status": "error", "message": "Unknown upload id"}), 404
+    meta = orjson.loads(meta_raw)
+
+    offset = request.headers.get("Upload-Offset", type=int)
+    chunk = request.get_data(cache=False)
+    expected = int(r.get(f"chunk:{upload_id}:received") or 0)
+    if offset is None or offset != expected:
+        # Client is out of step (e.g. retrying after a dropped response);
+        # it should HEAD for the current offset and resume from there.
+        resp = Response(status=409)
+        resp.headers["Upload-Offset"] = str(expected)
+        return resp
+    if offset + len(chunk) > meta["length"]:
+        return jsonify({"status": "error", "message": "Chunk exceeds Upload-Length"}), 400
+
+    part_path = os.path.join(PART_FOLDER, upload_id)
+    fd = os.open(part_path, os.O_WRONLY)
+    try:
+        os.pwrite(fd, chunk, offset)
+    finally:
+        os.close(fd)
+
+    received = offset + len(chunk)
+    r.setex(f"chunk:{upload_id}:received", CHUNK_STATE_TTL_SECONDS, received)
+    if received < meta["length"]:
+        resp = Response(status=204)
+        resp.headers["Upload-Offset"] = str(received)
+        return resp
+
+    # Last chunk: move the assembled file into place and persist metadata
+    # exactly once, the same way the single-request path does.
+    now = time.time()
+    safe_filename = f"{int(now)}_{secure_filename(meta['filename'])}"
+    save_path = os.path.join(UPLOAD_FOLDER, safe_filename)
+    os.replace(part_path, save_path)
+    r.delete(f"chunk:{upload_id}:meta", f"chunk:{upload_id}:received")
+    persist_metadata.delay(
+        safe_filename, meta["device_id"], meta["language"], now, save_path
+    )
+
+    return (
+        jsonify(
+            {
+                "status": "success",
+                "filename": safe_filename,
+                "uploaded_at": datetime.utcfromtimestamp(now).isoformat(),
+            }
+        ),
+        200,
+    )
+
+
+@app.route("/api/uploads", methods=["GET"])
+def get_uploads():
+    limit = request.args.get("limit", default=100, type=int)
+    if limit < 1:
+        return jsonify({"status": "error", "message": "'limit' must be positive"}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+    before = request.args.get("before")
+    if before is not None:
+        try:
+            before = datetime.fromisoformat(before)
+        except ValueError:
+            return (
+                jsonify(
+                    {
+                        "status": "error",
+                        "message": "'before' must be an ISO 8601 timestamp",
+                    }
+                ),
+                400,
+            )
+
+    # Only the default page is cached; it is what the polling frontend hits.
+    cacheable = limit == 100 and before is None
+    if cacheable:
+        cached = r.get(UPLOADS_CACHE_KEY)
+        if cached:
+            return Response(cached, mimetype="application/json")
+
+    uploads = list(fetch_all_uploads(limit=limit, before=before))
+    payload = orjson.dumps(
+        {"status": "success", "count": len(uploads), "data": uploads},
+        option=orjson.OPT_NAIVE_UTC,
+    )
+    if cacheable:
+        r.setex(UPLOADS_CACHE_KEY, CACHE_TTL_SECONDS, payload)
+    return Response(payload, mimetype="application/json")
+
+
+if __name__ == "__main__" and os.environ.get("FLASK_DEV"):
+    # Werkzeug dev server, one request at a time; production runs under
+    # gunicorn (see gunicorn.conf.py / Procfile).
+    app.run(debug=True)
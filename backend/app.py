@@ -0,0 +1,171 @@
+import atexit
+import os
+import threading
+from datetime import datetime, timezone
+
+import orjson
+import psycopg
+import redis
+from flask import Flask, Response, jsonify, request
+from psycopg_pool import ConnectionPool
+
+app = Flask(__name__)
+
+CONNINFO = psycopg.conninfo.make_conninfo(
+    host=os.environ.get("DB_HOST", "localhost"),
+    port=int(os.environ.get("DB_PORT", "5432")),
+    dbname=os.environ.get("DB_NAME", "crop_diagnosis"),
+    user=os.environ.get("DB_USER", "postgres"),
+    password=os.environ.get("DB_PASSWORD", "postgres"),
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Create the connection pool on first use.
+
+    Lazy so that importing the module (gunicorn's preload master, tests)
+    opens no sockets; each forked worker builds its own pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(CONNINFO, min_size=2, max_size=20)
+            atexit.register(_pool.close)
+    return _pool
+
+# Dedup keys live in Redis so every worker sees the same set and a
+# restart does not forget what has already been synced.
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+DEDUP_TTL_SECONDS = 86400
+
+SUBMISSIONS_CACHE_KEY = "submissions:v1"
+CACHE_TTL_SECONDS = 3
+MAX_PAGE_SIZE = 500
+
+r = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool.from_url(
+        REDIS_URL, max_connections=32
+    )
+)
+
+@app.route("/api/sync", methods=["POST"])
+def sync_data():
+    # cache=False keeps Flask from holding the raw body for the whole
+    # request; orjson parses it several times faster than stdlib json.
+    try:
+        data = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        data = None
+    if not data or "submissions" not in data:
+        return jsonify({"status": "error", "message": "No submissions in payload"}), 400
+
+    incoming_submissions = data["submissions"]
+    incoming = [sub for sub in incoming_submissions if sub.get("id")]
+
+    # One pipelined round-trip claims every id with SETNX; a None result
+    # means some other worker (or an earlier batch) already took it.
+    pipe = r.pipeline()
+    for sub in incoming:
+        pipe.set(f"dedup:{sub['id']}", "1", nx=True, ex=DEDUP_TTL_SECONDS)
+    claimed = pipe.execute()
+
+    new_subs = [sub for sub, added in zip(incoming, claimed) if added]
+    accepted_count = len(new_subs)
+    skipped_count = len(incoming_submissions) - accepted_count
+
+    if new_subs:
+        # Aware UTC so the TIMESTAMPTZ column stores the actual instant
+        # regardless of the server's timezone setting.
+        now = datetime.now(timezone.utc)
+        rows = [
+            (
+                sub["id"],
+                orjson.dumps(sub.get("data", {})).decode(),
+                now,
+                "diagnosis_pending",
+            )
+            for sub in new_subs
+        ]
+        # libpq pipeline mode (needs PostgreSQL 14+): all INSERTs are
+        # streamed without waiting on individual results, so the batch
+        # costs one round-trip instead of one per statement. ON CONFLICT
+        # keeps replayed batches idempotent on the DB side too.
+        try:
+            with _get_pool().connection() as conn:
+                with conn.pipeline():
+                    for row in rows:
+                        conn.execute(
+                            "INSERT INTO submissions (id, data, received_at, status) "
+                            "VALUES (%s, %s, %s, %s) ON CONFLICT (id) DO NOTHING",
+                            row,
+                        )
+        except Exception:
+            # The batch was not persisted: give the dedup claims back so
+            # the client's retry is accepted instead of skipped.
+            pipe = r.pipeline()
+            for sub in new_subs:
+                pipe.delete(f"dedup:{sub['id']}")
+            pipe.execute()
+            raise
+        r.delete(SUBMISSIONS_CACHE_KEY)
+
+    payload = orjson.dumps(
+        {
+            "status": "success",
+            "accepted": accepted_count,
+            "skipped": skipped_count,
+        }
+    )
+    return app.response_class(payload, mimetype="application/json")
+
+
+@app.route("/api/submissions", methods=["GET"])
+def get_submissions():
+    limit = request.args.get("limit", default=100, type=int)
+    offset = request.args.get("offset", default=0, type=int)
+    if limit < 1 or offset < 0:
+        return (
+            jsonify(
+                {
+                    "status": "error",
+                    "message": "'limit' must be positive and 'offset' non-negative",
+                }
+            ),
+            400,
+        )
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    # Only the default page is cached; it is what the polling frontend hits.
+    cacheable = limit == 100 and offset == 0
+    if cacheable:
+        cached = r.get(SUBMISSIONS_CACHE_KEY)
+        if cached:
+            return Response(cached, mimetype="application/json")
+
+    with _get_pool().connection() as conn:
+        rows = conn.execute(
+            "SELECT id, data, received_at, status FROM submissions "
+            "ORDER BY received_at DESC LIMIT %s OFFSET %s",
+            (limit, offset),
+        ).fetchall()
+
+    data = [
+        {"id": row[0], "data": row[1], "received_at": row[2], "status": row[3]}
+        for row in rows
+    ]
+    payload = orjson.dumps(
+        {"status": "success", "count": len(data), "data": data},
+        option=orjson.OPT_NAIVE_UTC,
+    )
+    if cacheable:
+        r.setex(SUBMISSIONS_CACHE_KEY, CACHE_TTL_SECONDS, payload)
+    return Response(payload, mimetype="application/json")
+
+
+if __name__ == "__main__" and os.environ.get("FLASK_DEV"):
+    # Werkzeug dev server, one request at a time; production runs under
+    # gunicorn (see gunicorn.conf.py / Procfile).
+    app.run(debug=True)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+
+
+class Media(Base):
+    __tablename__ = "media"
+
+    id = Column(Integer, primary_key=True, index=True)
+    media_id = Column(String, unique=True, index=True, nullable=False)
+    media_type = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="UPLOADED")
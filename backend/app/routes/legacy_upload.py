@@ -0,0 +1,107 @@
+import os
+import time
+from datetime import datetime
+
+import aiofiles
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from werkzeug.utils import secure_filename
+
+router = APIRouter()
+
+UPLOAD_FOLDER = "uploads"
+READ_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Same contract as the Flask route this ports: extension and MIME
+# whitelists plus a 10 MB cap. FastAPI has no MAX_CONTENT_LENGTH
+# equivalent, so the cap is enforced while streaming.
+_ALLOWED_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "mp4"})
+_ALLOWED_MIMETYPES = ("image/", "video/")
+MAX_FILE_SIZE_MB = 10
+_MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024
+MAX_PAGE_SIZE = 500
+
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+
+def allowed_file(filename):
+    return os.path.splitext(filename)[1][1:].lower() in _ALLOWED_EXTENSIONS
+
+
+@router.post("/api/upload")
+async def upload_media(
+    request: Request,
+    file: UploadFile = File(...),
+    device_id: str = Form("unknown"),
+    language: str = Form("en"),
+):
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file selected")
+    if not allowed_file(file.filename):
+        raise HTTPException(status_code=400, detail="File type not allowed")
+    # Defense in depth: the declared MIME type has to look like media too.
+    if file.content_type and not file.content_type.startswith(_ALLOWED_MIMETYPES):
+        raise HTTPException(status_code=400, detail="Media type not allowed")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > _MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds {MAX_FILE_SIZE_MB} MB limit",
+        )
+
+    timestamp = datetime.utcnow()
+    safe_filename = f"{int(time.time())}_{secure_filename(file.filename)}"
+    save_path = os.path.join(UPLOAD_FOLDER, safe_filename)
+
+    # Content-Length can lie (or be absent for a chunked body), so the
+    # cap is also enforced on the actual bytes as they stream in.
+    written = 0
+    async with aiofiles.open(save_path, "wb") as f:
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            written += len(chunk)
+            if written > _MAX_FILE_SIZE:
+                break
+            await f.write(chunk)
+    if written > _MAX_FILE_SIZE:
+        os.remove(save_path)
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds {MAX_FILE_SIZE_MB} MB limit",
+        )
+
+    pool = request.app.state.pg_pool
+    async with pool.acquire() as conn:
+        # asyncpg prepares and caches this statement per connection, so
+        # RETURNING id costs no extra round-trip.
+        row_id = await conn.fetchval(
+            "INSERT INTO media_uploads (filename, device_id, language, uploaded_at, file_path) "
+            "VALUES ($1, $2, $3, $4, $5) RETURNING id",
+            safe_filename,
+            device_id,
+            language,
+            timestamp,
+            save_path,
+        )
+
+    return {
+        "status": "success",
+        "id": row_id,
+        "filename": safe_filename,
+        "uploaded_at": timestamp.isoformat(),
+    }
+
+
+@router.get("/api/uploads")
+async def get_uploads(request: Request, limit: int = 100):
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="'limit' must be positive")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    pool = request.app.state.pg_pool
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT id, filename, device_id, language, uploaded_at, file_path "
+            "FROM media_uploads ORDER BY uploaded_at DESC LIMIT $1",
+            limit,
+        )
+    uploads = [dict(row) for row in rows]
+    return {"status": "success", "count": len(uploads), "data": uploads}
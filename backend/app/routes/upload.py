@@ -0,0 +1,109 @@
+import asyncio
+import errno
+import os
+import shutil
+import uuid
+
+from fastapi import APIRouter, File, Request, UploadFile
+
+from app.tasks import process_ml
+
+router = APIRouter()
+
+MEDIA_DIR = "media"
+COPY_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+os.makedirs(MEDIA_DIR, exist_ok=True)
+
+
+# Errors that mean "this kernel/filesystem combination won't do the
+# fast copy" rather than "the copy failed": cross-device (tmpfs spool ->
+# media dir, which Linux >= 5.19 refuses for copy_file_range), missing
+# syscall, or an unsupported fd type.
+_COPY_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL})
+
+
+def _kernel_copy(src_fd, dst_fd):
+    offset = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while n := os.copy_file_range(
+                src_fd, dst_fd, COPY_CHUNK_SIZE, offset_src=offset, offset_dst=offset
+            ):
+                offset += n
+            return
+        except OSError as exc:
+            if exc.errno not in _COPY_FALLBACK_ERRNOS or offset:
+                raise
+            # Refused up front; sendfile handles cross-device copies.
+    while n := os.sendfile(dst_fd, src_fd, offset, COPY_CHUNK_SIZE):
+        offset += n
+
+
+def _copy_upload(src, dst_path):
+    """Copy the spooled upload to dst_path, in kernel space when possible.
+
+    copy_file_range (can reflink on XFS/Btrfs) or sendfile moves the
+    bytes without round-tripping each chunk through a Python buffer;
+    shutil.copyfileobj stays as the fallback for platforms or fds the
+    kernel path refuses.
+    """
+    if getattr(src, "_rolled", None) is False:
+        # The spool is still in memory, i.e. a small upload: a buffered
+        # copy beats forcing it onto disk just to obtain an fd.
+        with open(dst_path, "wb") as buffer:
+            shutil.copyfileobj(src, buffer, length=COPY_CHUNK_SIZE)
+        return
+
+    try:
+        src_fd = src.fileno()
+    except (OSError, ValueError, AttributeError):
+        src_fd = None
+
+    if src_fd is not None and hasattr(os, "sendfile"):
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        dst_fd = os.open(dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _kernel_copy(src_fd, dst_fd)
+            return
+        except OSError as exc:
+            if exc.errno not in _COPY_FALLBACK_ERRNOS:
+                raise
+        finally:
+            os.close(dst_fd)
+
+    src.seek(0)
+    with open(dst_path, "wb") as buffer:
+        shutil.copyfileobj(src, buffer, length=COPY_CHUNK_SIZE)
+
+
+async def _write_file(file, file_path):
+    # The kernel-space copy helper is synchronous; run it off the event loop.
+    await asyncio.to_thread(_copy_upload, file.file, file_path)
+
+
+async def _insert_meta(pool, media_id, media_type):
+    async with pool.acquire() as conn:
+        return await conn.fetchval(
+            "INSERT INTO media (media_id, media_type, status) "
+            "VALUES ($1, $2, 'UPLOADED') RETURNING id",
+            media_id,
+            media_type,
+        )
+
+
+@router.post("/upload")
+async def upload_media(request: Request, file: UploadFile = File(...)):
+    media_id = str(uuid.uuid4())
+    file_path = os.path.join(MEDIA_DIR, media_id)
+
+    # The disk write and the metadata insert share nothing beyond
+    # media_id, so overlap them instead of running back to back.
+    _, row_id = await asyncio.gather(
+        _write_file(file, file_path),
+        _insert_meta(request.app.state.pg_pool, media_id, file.content_type),
+    )
+
+    process_ml.delay(media_id, file_path)
+
+    return {"status": "success", "id": row_id, "media_id": media_id}
@@ -0,0 +1,15 @@
+import os
+
+from celery import Celery
+
+celery = Celery(
+    "diagnosis",
+    broker=os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    backend=os.environ.get("CELERY_RESULT_BACKEND", "redis://localhost:6379/1"),
+)
+
+
+@celery.task
+def process_ml(media_id, file_path):
+    """Hand an uploaded media file to the ML diagnosis pipeline."""
+    print(f"Processing media {media_id} at {file_path}")
@@ -0,0 +1,16 @@
+import multiprocessing
+
+bind = "127.0.0.1:8000"
+workers = 2 * multiprocessing.cpu_count() + 1
+worker_class = "gthread"
+threads = 8
+# Match nginx's keepalive_timeout so polled requests reuse connections.
+keepalive = 65
+# Recycle workers periodically so slow leaks never accumulate; the
+# jitter keeps them from all restarting at once.
+max_requests = 1000
+max_requests_jitter = 100
+# Import the app once in the master so workers share read-only module
+# state via copy-on-write. Safe because app.py creates its DB pool
+# lazily on first use, i.e. after the fork, so no sockets are shared.
+preload_app = True
@@ -0,0 +1,25 @@
+-- Schema for the upload service (app.py) and sync service (backend/app.py).
+
+CREATE TABLE IF NOT EXISTS media_uploads (
+    id SERIAL PRIMARY KEY,
+    filename TEXT NOT NULL,
+    device_id TEXT NOT NULL DEFAULT 'unknown',
+    language TEXT NOT NULL DEFAULT 'en',
+    uploaded_at TIMESTAMPTZ NOT NULL,
+    file_path TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS submissions (
+    id TEXT PRIMARY KEY,
+    data JSONB NOT NULL DEFAULT '{}',
+    received_at TIMESTAMPTZ NOT NULL,
+    status TEXT NOT NULL DEFAULT 'diagnosis_pending'
+);
+
+-- Run outside a transaction block (CONCURRENTLY requires autocommit);
+-- makes the newest-first paginated listing an index scan.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_uploaded_at
+    ON media_uploads (uploaded_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_submissions_received_at
+    ON submissions (received_at DESC);
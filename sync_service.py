@@ -0,0 +1,19 @@
+"""Gunicorn entry point for the sync service (backend/app.py).
+
+Running `gunicorn app:app` from backend/ would import the backend/app/
+FastAPI package, which shadows backend/app.py. This module loads the
+Flask sync app by file path so production can run, from the repo root:
+
+    gunicorn -c gunicorn.conf.py sync_service:app
+"""
+
+import importlib.util
+import os
+
+_spec = importlib.util.spec_from_file_location(
+    "sync_app", os.path.join(os.path.dirname(__file__), "backend", "app.py")
+)
+_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_module)
+
+app = _module.app
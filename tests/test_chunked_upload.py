@@ -0,0 +1,102 @@
+"""Behavior tests for the chunked/resumable upload endpoints in app.py."""
+
+import os
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("psycopg2")
+pytest.importorskip("redis")
+pytest.importorskip("celery")
+pytest.importorskip("orjson")
+
+import app as upload_service  # noqa: E402  (needs the imports above)
+
+
+class FakeRedis:
+    """The few commands the chunked-upload endpoints use, over a dict."""
+
+    def __init__(self):
+        self.store = {}
+
+    @staticmethod
+    def _encode(value):
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = self._encode(value)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    part_folder = tmp_path / "partial"
+    part_folder.mkdir()
+    monkeypatch.setattr(upload_service, "r", FakeRedis())
+    monkeypatch.setattr(upload_service, "persist_metadata", mock.Mock())
+    monkeypatch.setattr(upload_service, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(upload_service, "PART_FOLDER", str(part_folder))
+    upload_service.app.config["TESTING"] = True
+    return upload_service.app.test_client()
+
+
+def _init(client, length, filename="field.mp4"):
+    resp = client.post(
+        "/api/upload/init",
+        headers={"Upload-Length": str(length), "Upload-Filename": filename},
+    )
+    assert resp.status_code == 201
+    return resp.get_json()["upload_id"]
+
+
+def test_out_of_order_patch_gets_409_with_expected_offset(client):
+    upload_id = _init(client, 4)
+    resp = client.patch(
+        f"/api/upload/{upload_id}", data=b"cd", headers={"Upload-Offset": "2"}
+    )
+    assert resp.status_code == 409
+    assert resp.headers["Upload-Offset"] == "0"
+
+
+def test_resume_after_drop_completes_the_file(client):
+    upload_id = _init(client, 4)
+    resp = client.patch(
+        f"/api/upload/{upload_id}", data=b"ab", headers={"Upload-Offset": "0"}
+    )
+    assert resp.status_code == 204
+    assert resp.headers["Upload-Offset"] == "2"
+
+    # After a dropped connection the client asks where to resume.
+    head = client.head(f"/api/upload/{upload_id}")
+    assert head.status_code == 200
+    assert head.headers["Upload-Offset"] == "2"
+
+    resp = client.patch(
+        f"/api/upload/{upload_id}", data=b"cd", headers={"Upload-Offset": "2"}
+    )
+    assert resp.status_code == 200
+    body = resp.get_json()
+    saved = os.path.join(upload_service.UPLOAD_FOLDER, body["filename"])
+    with open(saved, "rb") as f:
+        assert f.read() == b"abcd"
+    upload_service.persist_metadata.delay.assert_called_once()
+
+    # Finalized exactly once: the upload id is gone afterwards.
+    assert client.head(f"/api/upload/{upload_id}").status_code == 404
+
+
+def test_chunk_past_upload_length_is_rejected(client):
+    upload_id = _init(client, 4)
+    resp = client.patch(
+        f"/api/upload/{upload_id}", data=b"abcdef", headers={"Upload-Offset": "0"}
+    )
+    assert resp.status_code == 400